@@ -1,18 +1,23 @@
+import asyncio
 import json
-from typing import Iterator, Optional, List
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import AsyncIterator, Dict, Iterator, Optional, List, Type
 import os
 from flight_toolkit import FlightToolkit
 from agno.agent import Agent
 from agno.models.openai import OpenAIChat
+from agno.run.response import RunEvent as AgentRunEvent
 from agno.storage.workflow.sqlite import SqliteWorkflowStorage
 from agno.tools.google_maps import GoogleMapTools
 from agno.tools.googlesearch import GoogleSearchTools
 from agno.utils.log import logger
-from agno.utils.pprint import pprint_run_response
-from agno.workflow import RunEvent, RunResponse, Workflow
-from agno.playground import Playground, serve_playground_app
-from pydantic import BaseModel, Field
-from datetime import datetime, timedelta
+from agno.workflow import RunResponse, Workflow, WorkflowCompletedEvent
+import orjson
+from openai import OpenAI
+from pydantic import BaseModel, ConfigDict, Field
+from sqlalchemy import event
 from dotenv import load_dotenv  
 from simplified_map_tools import SimplifiedMapTools
 load_dotenv()
@@ -22,8 +27,15 @@ client_id = "CLIENT ID"
 client_secret = "SECRET-HERE"
 flight_toolkit = FlightToolkit(client_id=client_id, client_secret=client_secret, debug=True)
 
+# Shared tool instances, so their HTTP sessions are set up once and reused by all agents
+SIMPLIFIED_MAP_TOOLS = SimplifiedMapTools()
+GOOGLE_SEARCH = GoogleSearchTools()
+GOOGLE_MAPS = GoogleMapTools()
+
 # Define response models for structured outputs
 class FlightDetails(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     origin: str = Field(..., description="Origin airport code")
     destination: str = Field(..., description="Destination airport code")
     departure_date: str = Field(..., description="Departure date in YYYY-MM-DD format")
@@ -32,6 +44,8 @@ class FlightDetails(BaseModel):
     best_option: str = Field(..., description="The single best flight option with details")
 
 class DestinationInfo(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     accommodations: str = Field(..., description="Top hotels or accommodations with ratings and price ranges")
     dining: str = Field(..., description="Notable restaurants and eateries with cuisine types and ratings")
     attractions: str = Field(..., description="Key tourist attractions with brief descriptions")
@@ -39,6 +53,8 @@ class DestinationInfo(BaseModel):
     urls: Optional[List[str]] = Field(None, description="URLs for more information about the destination")
     
 class TravelInfo(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     destination: str = Field(..., description="Main destination city or location")
     duration: str = Field(..., description="Length of stay")
     travel_dates: str = Field(..., description="Travel dates")
@@ -46,16 +62,121 @@ class TravelInfo(BaseModel):
     preferences: str = Field(..., description="Traveler preferences (budget, luxury, adventure, etc.)")
     special_requests: Optional[str] = Field(None, description="Any special requests or considerations")
 
+@lru_cache(maxsize=None)
+def strict_response_format(response_model: Type[BaseModel]) -> dict:
+    """
+    Build the OpenAI json_schema response format for a model once, in strict mode
+    so the model itself is constrained to emit valid instances.
+    
+    Args:
+        response_model (Type[BaseModel]): Model the responses must be structured as
+        
+    Returns:
+        dict: response_format parameter for the chat completions API
+    """
+    schema = response_model.model_json_schema()
+    # Strict mode requires every property to be listed as required and no extra properties
+    for field_schema in schema["properties"].values():
+        field_schema.pop("default", None)
+    schema["required"] = list(schema["properties"])
+    schema["additionalProperties"] = False
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": response_model.__name__,
+            "schema": schema,
+            "strict": True
+        }
+    }
+
+def _drop_empty(value):
+    """Recursively drop None and empty values, they only add tokens to the prompt"""
+    if isinstance(value, dict):
+        value = {key: _drop_empty(item) for key, item in value.items()}
+        return {key: item for key, item in value.items() if item not in (None, "", [], {})}
+    if isinstance(value, list):
+        value = [_drop_empty(item) for item in value]
+        return [item for item in value if item not in (None, "", [], {})]
+    return value
+
+def format_travel_plan_input(travel_info: TravelInfo, flight_details: FlightDetails,
+                             destination_info: DestinationInfo) -> str:
+    """Compile all gathered information into a compact prompt for the travel plan generator"""
+    travel_plan_input = {
+        "travel_info": travel_info.model_dump(),
+        "flight_details": flight_details.model_dump(),
+        "destination_info": destination_info.model_dump()
+    }
+    return orjson.dumps(_drop_empty(travel_plan_input)).decode()
+
+# Agent instructions
+TRAVEL_INFO_INSTRUCTIONS = [
+    "You are a travel planning assistant that extracts key information from a user's travel plan or request.",
+    "Extract details about the desired destination, travel dates, duration, purpose, and preferences.",
+    "Ask clarifying questions if any essential information is missing.",
+    "Format the response as structured information about the travel plan."
+]
+
+# Today's date is added when the agent runs through add_datetime_to_instructions,
+# so it stays correct in long-running processes
+FLIGHT_SEARCH_INSTRUCTIONS = [
+    "You are a flight booking assistant that helps users find the best flights for their trip.",
+    "Use the flight toolkit to search for flights based on the user's travel information.",
+    "The flight search results will be returned as a JSON string. Parse this JSON to extract flight details.",
+    "Summarize the flight options clearly with departure/arrival times and prices.",
+    "Recommend the best option based on price, duration, and convenience.",
+    "Current date and time are passed with the instructions.",
+    "For flight searches, only use future dates (at least tomorrow or later)."
+]
+
+DESTINATION_INFO_INSTRUCTIONS = [
+    "You are a destination guide that provides comprehensive information about travel destinations.",
+    "Use the tools to find hotels, eating spots, tourist attractions, and transportation options.",
+    "Search all categories in a single search_places_multi call, with one query per category.",
+    "For each category, provide at least 3-5 recommendations with ratings, location details, and other relevant information.",
+    "Focus on options that match the traveler's preferences (budget, luxury, adventure, etc.).",
+    "Format the information clearly and concisely for easy reading.",
+    "Do not attempt to get directions between places, only search for locations."
+]
+
+NAVIGATION_INSTRUCTIONS = [
+    "You are a navigation assistant that helps travelers get from one place to another.",
+    "Use Google Maps to show directions between locations when asked by the user.",
+    "Provide step-by-step directions with transportation options (walking, public transit, driving, etc.).",
+    "Include estimated travel times and distances.",
+    "Format directions in a clear, easy-to-follow manner."
+]
+
+TRAVEL_PLAN_INSTRUCTIONS = [
+    "You are a travel plan generator that creates comprehensive itineraries.",
+    "Using all the provided information about flights, accommodations, attractions, and transportation,",
+    "Create a day-by-day itinerary that includes flight details, where to stay, what to see/do, and where to eat.",
+    "Make the plan realistic in terms of timing and distances.",
+    "Format the plan as a well-structured travel itinerary with headings and sections.",
+    "Include practical tips specific to the destination."
+]
+
+# Agent queries built from the extracted travel information
+FLIGHT_QUERY_TMPL = (
+    "I need flights to {destination}. "
+    "Departing around {travel_dates}. "
+    "My trip is for {duration}. "
+    "Preferences: {preferences}. "
+    "Purpose: {purpose}. "
+)
+
+DEST_QUERY_TMPL = (
+    "I'm traveling to {destination} for {duration}. "
+    "Please find me good {preferences} accommodations, "
+    "restaurants, tourist attractions, and public transportation options near city center. "
+    "Purpose of visit: {purpose}. "
+)
+
 class TravelPlannerWorkflow(Workflow):
     # Agent 1: Travel Information Extractor
     travel_info_agent: Agent = Agent(
         model=OpenAIChat(id="gpt-4o-mini"),
-        instructions=[
-            "You are a travel planning assistant that extracts key information from a user's travel plan or request.",
-            "Extract details about the desired destination, travel dates, duration, purpose, and preferences.",
-            "Ask clarifying questions if any essential information is missing.",
-            "Format the response as structured information about the travel plan."
-        ],
+        instructions=TRAVEL_INFO_INSTRUCTIONS,
         add_history_to_messages=True,
         add_datetime_to_instructions=True,
         response_model=TravelInfo,
@@ -67,16 +188,7 @@ class TravelPlannerWorkflow(Workflow):
     flight_search_agent: Agent = Agent(
         model=OpenAIChat(id="gpt-4o-mini"),
         tools=[flight_toolkit],
-        instructions=[
-            "You are a flight booking assistant that helps users find the best flights for their trip.",
-            "Use the flight toolkit to search for flights based on the user's travel information.",
-            "The flight search results will be returned as a JSON string. Parse this JSON to extract flight details.",
-            "Summarize the flight options clearly with departure/arrival times and prices.",
-            "Recommend the best option based on price, duration, and convenience.",
-            "Current date and time are passed with the instructions.",
-            "For flight searches, only use future dates (at least tomorrow or later).",
-            f"Today's date is {datetime.now().strftime('%Y-%m-%d')}"
-        ],
+        instructions=FLIGHT_SEARCH_INSTRUCTIONS,
         add_history_to_messages=True,
         add_datetime_to_instructions=True,
         response_model=FlightDetails,
@@ -88,15 +200,8 @@ class TravelPlannerWorkflow(Workflow):
     # Agent 3: Destination Information Agent
     destination_info_agent: Agent = Agent(
         model=OpenAIChat(id="gpt-4o-mini"),
-        tools=[SimplifiedMapTools(), GoogleSearchTools()],  # Use simplified tools instead
-        instructions=[
-            "You are a destination guide that provides comprehensive information about travel destinations.",
-            "Use the tools to find hotels, eating spots, tourist attractions, and transportation options.",
-            "For each category, provide at least 3-5 recommendations with ratings, location details, and other relevant information.",
-            "Focus on options that match the traveler's preferences (budget, luxury, adventure, etc.).",
-            "Format the information clearly and concisely for easy reading.",
-            "Do not attempt to get directions between places, only search for locations."
-        ],
+        tools=[SIMPLIFIED_MAP_TOOLS, GOOGLE_SEARCH],  # Use simplified tools instead
+        instructions=DESTINATION_INFO_INSTRUCTIONS,
         add_history_to_messages=True,
         add_datetime_to_instructions=True,
         response_model=DestinationInfo,
@@ -108,14 +213,8 @@ class TravelPlannerWorkflow(Workflow):
     # Agent 4: Navigation Agent
     navigation_agent: Agent = Agent(
         model=OpenAIChat(id="gpt-4o-mini"),
-        tools=[GoogleMapTools()],
-        instructions=[
-            "You are a navigation assistant that helps travelers get from one place to another.",
-            "Use Google Maps to show directions between locations when asked by the user.",
-            "Provide step-by-step directions with transportation options (walking, public transit, driving, etc.).",
-            "Include estimated travel times and distances.",
-            "Format directions in a clear, easy-to-follow manner."
-        ],
+        tools=[GOOGLE_MAPS],
+        instructions=NAVIGATION_INSTRUCTIONS,
         add_history_to_messages=True,
         markdown=True,
         show_tool_calls=True,
@@ -125,23 +224,16 @@ class TravelPlannerWorkflow(Workflow):
     # Agent 5: Travel Plan Generator
     travel_plan_agent: Agent = Agent(
         model=OpenAIChat(id="gpt-4o"),
-        instructions=[
-            "You are a travel plan generator that creates comprehensive itineraries.",
-            "Using all the provided information about flights, accommodations, attractions, and transportation,",
-            "Create a day-by-day itinerary that includes flight details, where to stay, what to see/do, and where to eat.",
-            "Make the plan realistic in terms of timing and distances.",
-            "Format the plan as a well-structured travel itinerary with headings and sections.",
-            "Include practical tips specific to the destination."
-        ],
+        instructions=TRAVEL_PLAN_INSTRUCTIONS,
         add_history_to_messages=True,
         markdown=True,
         debug_mode=False,
     )
 
-    def extract_travel_info(self, travel_request: str) -> Optional[TravelInfo]:
+    async def extract_travel_info(self, travel_request: str) -> Optional[TravelInfo]:
         """Extract essential travel information from the user's request"""
         try:
-            response: RunResponse = self.travel_info_agent.run(travel_request)
+            response: RunResponse = await self.travel_info_agent.arun(travel_request)
             
             if not response or not response.content:
                 logger.warning("Empty Travel Information response")
@@ -155,19 +247,13 @@ class TravelPlannerWorkflow(Workflow):
             
         return None
     
-    def search_flights(self, travel_info: TravelInfo) -> Optional[FlightDetails]:
+    async def search_flights(self, travel_info: TravelInfo) -> Optional[FlightDetails]:
         """Search for flights based on travel information"""
         try:
             # Format the input for flight search
-            flight_search_query = (
-                f"I need flights to {travel_info.destination}. "
-                f"Departing around {travel_info.travel_dates}. "
-                f"My trip is for {travel_info.duration}. "
-                f"Preferences: {travel_info.preferences}. "
-                f"Purpose: {travel_info.purpose}. "
-            )
+            flight_search_query = FLIGHT_QUERY_TMPL.format(**travel_info.model_dump())
             
-            response: RunResponse = self.flight_search_agent.run(flight_search_query)
+            response: RunResponse = await self.flight_search_agent.arun(flight_search_query)
             
             if not response or not response.content:
                 logger.warning("Empty Flight Search response")
@@ -181,18 +267,13 @@ class TravelPlannerWorkflow(Workflow):
             
         return None
     
-    def get_destination_info(self, travel_info: TravelInfo) -> Optional[DestinationInfo]:
+    async def get_destination_info(self, travel_info: TravelInfo) -> Optional[DestinationInfo]:
         """Get detailed information about the destination"""
         try:
             # Format the query for destination info
-            destination_query = (
-                f"I'm traveling to {travel_info.destination} for {travel_info.duration}. "
-                f"Please find me good {travel_info.preferences} accommodations, "
-                f"restaurants, tourist attractions, and public transportation options near city center. "
-                f"Purpose of visit: {travel_info.purpose}. "
-            )
+            destination_query = DEST_QUERY_TMPL.format(**travel_info.model_dump())
             
-            response: RunResponse = self.destination_info_agent.run(destination_query)
+            response: RunResponse = await self.destination_info_agent.arun(destination_query)
             
             if not response or not response.content:
                 logger.warning("Empty Destination Information response")
@@ -231,73 +312,83 @@ class TravelPlannerWorkflow(Workflow):
             
         return None
     
-    def generate_travel_plan(self, travel_info: TravelInfo, flight_details: FlightDetails, 
-                            destination_info: DestinationInfo) -> Optional[str]:
-        """Generate a comprehensive travel plan using all gathered information"""
+    async def generate_travel_plan(self, travel_info: TravelInfo, flight_details: FlightDetails, 
+                                   destination_info: DestinationInfo) -> AsyncIterator[str]:
+        """
+        Generate a comprehensive travel plan using all gathered information, streamed in chunks.
+        
+        Raises:
+            Exception: If generation fails, possibly after some chunks were already yielded
+        """
         try:
-            # Compile all information for the travel plan generator
-            travel_plan_input = {
-                "travel_info": travel_info.model_dump(),
-                "flight_details": flight_details.model_dump(),
-                "destination_info": destination_info.model_dump()
-            }
+            travel_plan_input = format_travel_plan_input(travel_info, flight_details, destination_info)
             
-            response: RunResponse = self.travel_plan_agent.run(json.dumps(travel_plan_input, indent=4))
-            
-            if not response or not response.content:
-                logger.warning("Empty Travel Plan response")
-                
-            return response.content
+            async for chunk in await self.travel_plan_agent.arun(travel_plan_input, stream=True):
+                # agno reports errors during a streamed run as an event instead of raising
+                if chunk and chunk.event == AgentRunEvent.run_error:
+                    raise RuntimeError(chunk.content)
+                if chunk and chunk.content:
+                    yield chunk.content
             
         except Exception as e:
             logger.warning(f"Failed to generate travel plan: {str(e)}")
-            
-        return None
+            raise
     
-    def run(self, travel_request: str) -> Iterator[RunResponse]:
+    async def arun(self, travel_request: str) -> AsyncIterator[RunResponse]:
         """Run the complete travel planning workflow"""
         logger.info(f"Generating a travel plan for: {travel_request}")
         
         # Step 1: Extract travel information
         yield RunResponse(content="Extracting travel details...")
-        travel_info: Optional[TravelInfo] = self.extract_travel_info(travel_request)
+        travel_info: Optional[TravelInfo] = await self.extract_travel_info(travel_request)
         
         if travel_info is None:
-            yield RunResponse(
-                event=RunEvent.workflow_completed,
+            yield WorkflowCompletedEvent(
+                run_id=self.run_id,
                 content="Sorry, I couldn't extract the necessary travel information. Please provide more details about your trip."
             )
             return
         
-        # Step 2: Search for flights
-        yield RunResponse(content="Searching for flights...")
-        flight_details: Optional[FlightDetails] = self.search_flights(travel_info)
+        # Steps 2 & 3: Search for flights and get destination information concurrently,
+        # both only depend on the extracted travel information
+        yield RunResponse(content="Searching for flights and finding accommodation, dining, and attractions...")
+        flights_task = asyncio.create_task(self.search_flights(travel_info))
+        destination_task = asyncio.create_task(self.get_destination_info(travel_info))
+        flight_details, destination_info = await asyncio.gather(flights_task, destination_task)
         
         if flight_details is None:
-            yield RunResponse(
-                event=RunEvent.workflow_completed,
+            yield WorkflowCompletedEvent(
+                run_id=self.run_id,
                 content="Could not find suitable flights for your travel dates. Please try different dates or destinations."
             )
             return
         
-        # Step 3: Get destination information
-        yield RunResponse(content="Finding accommodation, dining, and attractions...")
-        destination_info: Optional[DestinationInfo] = self.get_destination_info(travel_info)
-        
         if destination_info is None:
-            yield RunResponse(
-                event=RunEvent.workflow_completed,
+            yield WorkflowCompletedEvent(
+                run_id=self.run_id,
                 content="Could not find detailed information about your destination. Let's continue with what we have."
             )
             return
         
         # Step 4: Generate travel plan
         yield RunResponse(content="Generating your complete travel plan...")
-        travel_plan: Optional[str] = self.generate_travel_plan(travel_info, flight_details, destination_info)
+        travel_plan_generated = False
+        try:
+            async for travel_plan_chunk in self.generate_travel_plan(travel_info, flight_details, destination_info):
+                travel_plan_generated = True
+                yield RunResponse(content=travel_plan_chunk)
+        except Exception:
+            if travel_plan_generated:
+                yield WorkflowCompletedEvent(
+                    run_id=self.run_id,
+                    content="\n\n**The travel plan above is incomplete**: its generation was interrupted. Please try again."
+                )
+                return
         
-        if travel_plan is None:
-            yield RunResponse(
-                event=RunEvent.workflow_completed,
+        if not travel_plan_generated:
+            logger.warning("Empty Travel Plan response")
+            yield WorkflowCompletedEvent(
+                run_id=self.run_id,
                 content="Could not generate a complete travel plan. Here's what I found so far:\n\n" +
                         f"**Flight Options**: {flight_details.recommended_flights}\n\n" +
                         f"**Best Flight**: {flight_details.best_option}\n\n" +
@@ -308,22 +399,206 @@ class TravelPlannerWorkflow(Workflow):
             )
             return
         
-        # Return the complete travel plan
-        yield RunResponse(content=travel_plan, event=RunEvent.workflow_completed)
+        # The travel plan has been streamed in chunks, only mark the workflow as completed
+        yield WorkflowCompletedEvent(run_id=self.run_id)
+    
+    def run(self, travel_request: str) -> Iterator[RunResponse]:
+        """
+        Run the complete travel planning workflow synchronously, this is the entrypoint
+        the Playground calls. Drives arun() on a private event loop.
+        """
+        loop = asyncio.new_event_loop()
+        responses = self.arun(travel_request=travel_request)
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(responses.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            loop.run_until_complete(responses.aclose())
+            loop.run_until_complete(self._aclose_map_tools())
+            loop.close()
+    
+    @classmethod
+    def run_batch(cls, travel_requests: List[str], poll_interval: float = 30.0) -> List[Optional[str]]:
+        """
+        Plan many trips offline, sending the extraction and plan generation stages
+        through the OpenAI Batch API instead of one request per prompt.
+        
+        Args:
+            travel_requests (List[str]): Travel requests in natural language
+            poll_interval (float): Seconds to wait between batch status checks
+            
+        Returns:
+            List[Optional[str]]: Travel plan for each request, None where planning failed
+        """
+        client = OpenAI()
+        planner = cls()
+        
+        # Step 1: Extract travel information for all requests in one batch
+        extracted = planner._run_openai_batch(
+            client,
+            planner.travel_info_agent,
+            {str(i): request for i, request in enumerate(travel_requests)},
+            response_model=TravelInfo,
+            poll_interval=poll_interval,
+        )
+        travel_infos: List[Optional[TravelInfo]] = []
+        for i in range(len(travel_requests)):
+            try:
+                # The strict response format already guarantees the schema, so skip re-validating it
+                travel_infos.append(TravelInfo.model_construct(**json.loads(extracted[str(i)])))
+            except Exception as e:
+                logger.warning(f"Failed to extract travel info for request {i}: {str(e)}")
+                travel_infos.append(None)
+        
+        # Steps 2 & 3: Flight and destination agents call tools, so they run concurrently
+        # through the regular agents rather than the Batch API
+        trip_details = asyncio.run(planner._gather_trip_details(travel_infos))
+        
+        # Step 4: Generate all travel plans in one batch
+        plan_inputs: Dict[str, str] = {}
+        for i, (travel_info, (flight_details, destination_info)) in enumerate(zip(travel_infos, trip_details)):
+            if travel_info and flight_details and destination_info:
+                plan_inputs[str(i)] = format_travel_plan_input(travel_info, flight_details, destination_info)
+        
+        travel_plans = planner._run_openai_batch(
+            client, planner.travel_plan_agent, plan_inputs, poll_interval=poll_interval
+        ) if plan_inputs else {}
+        
+        return [travel_plans.get(str(i)) for i in range(len(travel_requests))]
+    
+    async def _gather_trip_details(self, travel_infos: List[Optional[TravelInfo]]) -> list:
+        """Search flights and destination information for every extracted trip concurrently"""
+        async def trip_details(travel_info: Optional[TravelInfo]):
+            if travel_info is None:
+                return None, None
+            return await asyncio.gather(self.search_flights(travel_info), self.get_destination_info(travel_info))
+        
+        try:
+            return await asyncio.gather(*[trip_details(travel_info) for travel_info in travel_infos])
+        finally:
+            # run_batch gives each call its own event loop, close the HTTP clients opened on it
+            await self._aclose_map_tools()
+    
+    async def _aclose_map_tools(self) -> None:
+        """Close the HTTP clients the map tools opened on the running event loop"""
+        for tool in self.destination_info_agent.tools or []:
+            if isinstance(tool, SimplifiedMapTools):
+                await tool.aclose()
+    
+    @staticmethod
+    def _run_openai_batch(client: OpenAI, agent: Agent, prompts: Dict[str, str],
+                          response_model: Optional[Type[BaseModel]] = None,
+                          poll_interval: float = 30.0) -> Dict[str, str]:
+        """
+        Submit one chat completion per prompt as a single OpenAI batch and wait for it.
+        
+        Args:
+            client (OpenAI): OpenAI client
+            agent (Agent): Agent whose model and instructions are used for every prompt
+            prompts (Dict[str, str]): User prompts keyed by custom_id
+            response_model (Type[BaseModel], optional): Model the responses must be structured as
+            poll_interval (float): Seconds to wait between batch status checks
+            
+        Returns:
+            Dict[str, str]: Response content keyed by custom_id, for the successful requests only
+        """
+        system_prompt = "\n".join(agent.instructions)
+        # Match the date context agno adds for interactive runs, so relative dates resolve the same way
+        if agent.add_datetime_to_instructions:
+            system_prompt += f"\nThe current time is {datetime.now()}."
+        lines = []
+        for custom_id, prompt in prompts.items():
+            body = {
+                "model": agent.model.id,
+                "messages": [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt}
+                ]
+            }
+            if response_model is not None:
+                body["response_format"] = strict_response_format(response_model)
+            lines.append(json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body
+            }))
+        
+        batch_file = client.files.create(file=("batch.jsonl", "\n".join(lines).encode()), purpose="batch")
+        batch = client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.info(f"Submitted batch {batch.id} with {len(lines)} requests")
+        
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(poll_interval)
+            batch = client.batches.retrieve(batch.id)
+        
+        if batch.status != "completed":
+            logger.warning(f"Batch {batch.id} finished with status {batch.status}")
+        if not batch.output_file_id:
+            return {}
+        
+        # Demultiplex the results by custom_id
+        results = {}
+        for line in client.files.content(batch.output_file_id).text.splitlines():
+            record = json.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") != 200:
+                logger.warning(f"Batch request {record['custom_id']} failed: {record.get('error')}")
+                continue
+            results[record["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+        
+        return results
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Configure every new SQLite connection for concurrent Playground requests"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
+class WalSqliteWorkflowStorage(SqliteWorkflowStorage):
+    """SQLite workflow storage in write-ahead logging mode, so reads don't wait on the writer"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        event.listen(self.db_engine, "connect", _set_sqlite_pragmas)
+        # Drop any pooled connection opened before the pragmas were registered
+        self.db_engine.dispose()
 
 # Create the workflow instance
 tour_more_ai_workflow = TravelPlannerWorkflow(
     name="TourMoreAI Travel Planner",
     workflow_id=f"tour-more-ai-planner",
     description="Complete travel planning workflow with flights, accommodations, and itinerary",
-    storage=SqliteWorkflowStorage(
+    storage=WalSqliteWorkflowStorage(
         table_name="tour_more_ai_workflow",
         db_file="tmp/agno_workflows.db",
     ),
 )
 
-# Create and serve the playground app
-app = Playground(workflows=[tour_more_ai_workflow]).get_app()
+# Create and serve the playground app. The app is only built when `app` is first accessed
+# (uvicorn does so in the server process), so plain imports of this module skip it.
+@lru_cache(maxsize=1)
+def get_app():
+    from agno.playground import Playground
+    
+    return Playground(workflows=[tour_more_ai_workflow]).get_app()
+
+def __getattr__(name):
+    if name == "app":
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if __name__ == "__main__":
+    from agno.playground import serve_playground_app
+    
     serve_playground_app(f"{os.path.splitext(os.path.basename(__file__))[0]}:app", reload=True)
@@ -1,6 +1,14 @@
-import json
+import asyncio
 import logging
+import anyio
+import msgspec
+import orjson
+import weakref
 from datetime import datetime, timedelta
+from functools import lru_cache, partial
+from threading import Lock
+from cachetools import TTLCache
+from aiolimiter import AsyncLimiter
 from amadeus import Client, ResponseError
 from typing import Optional, Dict, Any, List
 from agno.tools import Toolkit
@@ -8,6 +16,75 @@ from agno.utils.log import logger
 from agno.agent import Agent
 from agno.models.openai import OpenAIChat
 
+@lru_cache(maxsize=1)
+def get_amadeus_client(client_id: str, client_secret: str, debug: bool = False) -> Client:
+    """
+    Get the shared Amadeus client, so its access token and HTTP connections
+    are reused across FlightToolkit instances.
+    
+    Args:
+        client_id (str): Amadeus API client ID
+        client_secret (str): Amadeus API client secret
+        debug (bool): Enable debug mode for detailed logging
+        
+    Returns:
+        Client: Amadeus API client
+    """
+    return Client(
+        client_id=client_id,
+        client_secret=client_secret,
+        logger=logger if debug else None,
+        log_level='debug' if debug else 'warning',
+        hostname='test'
+    )
+
+# Typed schema of the Amadeus flight offers response, limited to the fields we use.
+# The Amadeus SDK has already parsed the body into response.data, so decoding it into
+# these structs is a second parse of the response. It is a fast one, and in exchange the
+# 'N/A' fallbacks are declared once here and the response shape is checked up front.
+class _FlightEndpoint(msgspec.Struct):
+    iataCode: str
+    at: str
+    terminal: str = 'N/A'
+
+class _Aircraft(msgspec.Struct):
+    code: str = 'N/A'
+
+class _FlightSegment(msgspec.Struct):
+    departure: _FlightEndpoint
+    arrival: _FlightEndpoint
+    carrierCode: str
+    number: str
+    aircraft: _Aircraft = msgspec.field(default_factory=_Aircraft)
+    duration: str = 'N/A'
+
+class _Itinerary(msgspec.Struct):
+    segments: List[_FlightSegment]
+    duration: str = 'N/A'
+
+class _Price(msgspec.Struct):
+    total: str
+    currency: str
+
+class _FlightOffer(msgspec.Struct):
+    id: str
+    price: _Price
+    itineraries: List[_Itinerary]
+
+class _FlightOffersResponse(msgspec.Struct):
+    data: List[_FlightOffer] = []
+
+# Built once at import, so each search reuses the decoder compiled for the schema
+_FLIGHT_OFFERS_DECODER = msgspec.json.Decoder(_FlightOffersResponse)
+
+def _parse_date(date_str: str) -> datetime:
+    """Parse a YYYY-MM-DD date, avoiding the regex and locale overhead of datetime.strptime"""
+    year, month, day = date_str[:4], date_str[5:7], date_str[8:]
+    if (len(date_str) != 10 or date_str[4] != '-' or date_str[7] != '-'
+            or not (year.isdigit() and month.isdigit() and day.isdigit())):
+        raise ValueError(f"Invalid date: {date_str!r}")
+    return datetime(int(year), int(month), int(day))
+
 class FlightToolkit(Toolkit):
     def __init__(self, client_id: str, client_secret: str, debug: bool = False):
         """
@@ -22,16 +99,16 @@ class FlightToolkit(Toolkit):
         self.client_id = client_id
         self.client_secret = client_secret
         self.debug = debug
-        self.amadeus = Client(
-            client_id=client_id,
-            client_secret=client_secret,
-            logger=logger if debug else None,
-            log_level='debug' if debug else 'warning',
-            hostname='test'
-        )
+        self.amadeus = get_amadeus_client(client_id, client_secret, debug)
+        # Identical searches within 5 minutes are served from memory
+        self._search_cache = TTLCache(maxsize=1024, ttl=300)
+        self._search_cache_lock = Lock()
+        # Cap in-flight Amadeus requests and sustained QPS so concurrent searches don't run into
+        # 429 retries (created per running event loop, since they are bound to their loop)
+        self._rate_limits_by_loop = weakref.WeakKeyDictionary()
         self.register(self.search_flights)
     
-    def search_flights(self, 
+    async def search_flights(self, 
                      origin: str, 
                      destination: str, 
                      departure_date: str, 
@@ -62,6 +139,15 @@ class FlightToolkit(Toolkit):
         if self.debug:
             logger.info(f"Amadeus client configuration: {self.amadeus.host}")
         
+        cache_key = (origin, destination, departure_date, return_date, adults,
+                     currency, max_results, non_stop, travel_class)
+        with self._search_cache_lock:
+            cached_results = self._search_cache.get(cache_key)
+        if cached_results is not None:
+            if self.debug:
+                logger.info(f"Returning cached results for: {cache_key}")
+            return cached_results
+        
         try:
             # Validate inputs
             self._validate_inputs(origin, destination, departure_date, return_date, adults)
@@ -96,11 +182,21 @@ class FlightToolkit(Toolkit):
                 logger.info(f"Request parameters: {kwargs}")
             
             # Make API call
-            response = self.amadeus.shopping.flight_offers_search.get(**kwargs)
+            # The Amadeus SDK is synchronous, run it in a worker thread so the event loop isn't blocked
+            semaphore, limiter = self._loop_rate_limits()
+            async with semaphore, limiter:
+                response = await anyio.to_thread.run_sync(
+                    partial(self.amadeus.shopping.flight_offers_search.get, **kwargs)
+                )
             
             # Process the response and convert to JSON string
-            processed_results = self._process_flight_results(response.data)
-            return json.dumps(processed_results, indent=2)  # Convert dict to JSON string
+            flight_offers = _FLIGHT_OFFERS_DECODER.decode(response.body).data
+            processed_results = self._process_flight_results(flight_offers)
+            results_json = orjson.dumps(processed_results, option=orjson.OPT_INDENT_2).decode()  # Convert dict to JSON string
+            
+            with self._search_cache_lock:
+                self._search_cache[cache_key] = results_json
+            return results_json
         
         except ResponseError as error:
             error_details = self._parse_error_response(error)
@@ -108,6 +204,12 @@ class FlightToolkit(Toolkit):
             # Return error as string instead of dict
             return f"Error searching flights: {error_details}"
         
+        except msgspec.DecodeError as error:
+            # Checked before ValueError, which msgspec's errors subclass: this is an unexpected
+            # response from Amadeus, not a problem with the search parameters
+            logger.error(f"Unexpected API response: {error}")
+            return f"Error reading flight search results: {str(error)}"
+        
         except ValueError as error:
             logger.error(f"Validation Error: {error}")
             # Return error as string instead of dict
@@ -118,6 +220,20 @@ class FlightToolkit(Toolkit):
             # Return error as string instead of dict
             return f"An unexpected error occurred: {str(error)}"
     
+    def _loop_rate_limits(self):
+        """
+        Get the limits for Amadeus requests on the running event loop, creating them on first use.
+        
+        Returns:
+            tuple: (asyncio.Semaphore capping in-flight requests, AsyncLimiter capping requests per second)
+        """
+        loop = asyncio.get_running_loop()
+        rate_limits = self._rate_limits_by_loop.get(loop)
+        if rate_limits is None:
+            # The Amadeus test environment allows 10 requests per second
+            rate_limits = self._rate_limits_by_loop[loop] = (asyncio.Semaphore(8), AsyncLimiter(10, 1))
+        return rate_limits
+    
     def _validate_inputs(self, origin, destination, departure_date, return_date, adults):
         """Validate input parameters"""
         
@@ -128,25 +244,23 @@ class FlightToolkit(Toolkit):
         if len(origin) != 3 or len(destination) != 3:
             raise ValueError("Airport codes must be 3-letter IATA codes")
         
-        # Validate date format
+        # Validate date format, parsing each date only once
+        departure_dt = None
         if departure_date:
             try:
-                departure_dt = datetime.strptime(departure_date, '%Y-%m-%d')
+                departure_dt = _parse_date(departure_date)
             except ValueError:
                 raise ValueError("Departure date must be in YYYY-MM-DD format")
         
         if return_date:
             try:
-                return_dt = datetime.strptime(return_date, '%Y-%m-%d')
-                
-                # Check if return date is after departure date
-                if departure_date and return_dt < datetime.strptime(departure_date, '%Y-%m-%d'):
-                    raise ValueError("Return date must be after departure date")
-            except ValueError as e:
-                if "must be after" in str(e):
-                    raise e
-                else:
-                    raise ValueError("Return date must be in YYYY-MM-DD format")
+                return_dt = _parse_date(return_date)
+            except ValueError:
+                raise ValueError("Return date must be in YYYY-MM-DD format")
+            
+            # Check if return date is after departure date
+            if departure_dt and return_dt < departure_dt:
+                raise ValueError("Return date must be after departure date")
         
         # Validate adults
         if not isinstance(adults, int) or adults < 1:
@@ -156,8 +270,8 @@ class FlightToolkit(Toolkit):
         """Extract detailed error information from Amadeus error response"""
         try:
             if hasattr(error, 'response'):
-                if hasattr(error.response, 'body') and error.response.body:
-                    error_body = json.loads(error.response.body)
+                if hasattr(error.response, 'body') and error.response.body and self._is_json_response(error.response):
+                    error_body = orjson.loads(error.response.body)
                     if 'errors' in error_body and error_body['errors']:
                         error_details = []
                         for err in error_body['errors']:
@@ -170,12 +284,18 @@ class FlightToolkit(Toolkit):
         except Exception:
             return str(error)
     
+    def _is_json_response(self, response):
+        """Check whether an Amadeus response body is JSON, assuming it is when no content type is known"""
+        headers = getattr(getattr(response, 'http_response', None), 'headers', None)
+        content_type = headers.get('Content-Type', '') if headers else ''
+        return not content_type or 'json' in content_type
+    
     def _process_flight_results(self, flight_data):
         """
         Process and simplify flight search results.
         
         Args:
-            flight_data (list): Raw flight data from Amadeus API
+            flight_data (List[_FlightOffer]): Flight offers decoded from the Amadeus API response
             
         Returns:
             dict: Simplified flight data
@@ -183,60 +303,55 @@ class FlightToolkit(Toolkit):
         if not flight_data:
             return {"count": 0, "flights": []}
         
-        processed_results = {
-            "count": len(flight_data),
-            "flights": []
-        }
-        
+        flights = []
         for offer in flight_data:
-            flight_details = {
-                "id": offer['id'],
+            price = offer.price
+            flights.append({
+                "id": offer.id,
                 "price": {
-                    "total": offer['price']['total'],
-                    "currency": offer['price']['currency']
+                    "total": price.total,
+                    "currency": price.currency
                 },
-                "itineraries": []
-            }
-            
-            for itinerary in offer['itineraries']:
-                segments = []
-                
-                for segment in itinerary['segments']:
-                    segments.append({
-                        "departure": {
-                            "iataCode": segment['departure']['iataCode'],
-                            "terminal": segment['departure'].get('terminal', 'N/A'),
-                            "at": segment['departure']['at']
-                        },
-                        "arrival": {
-                            "iataCode": segment['arrival']['iataCode'],
-                            "terminal": segment['arrival'].get('terminal', 'N/A'),
-                            "at": segment['arrival']['at']
-                        },
-                        "carrierCode": segment['carrierCode'],
-                        "flightNumber": segment['number'],
-                        "aircraft": segment.get('aircraft', {}).get('code', 'N/A'),
-                        "duration": segment.get('duration', 'N/A')
-                    })
-                
-                flight_details["itineraries"].append({
-                    "duration": itinerary.get('duration', 'N/A'),
-                    "segments": segments
-                })
-            
-            processed_results["flights"].append(flight_details)
+                "itineraries": [
+                    {
+                        "duration": itinerary.duration,
+                        "segments": [
+                            {
+                                "departure": {
+                                    "iataCode": segment.departure.iataCode,
+                                    "terminal": segment.departure.terminal,
+                                    "at": segment.departure.at
+                                },
+                                "arrival": {
+                                    "iataCode": segment.arrival.iataCode,
+                                    "terminal": segment.arrival.terminal,
+                                    "at": segment.arrival.at
+                                },
+                                "carrierCode": segment.carrierCode,
+                                "flightNumber": segment.number,
+                                "aircraft": segment.aircraft.code,
+                                "duration": segment.duration
+                            }
+                            for segment in itinerary.segments
+                        ]
+                    }
+                    for itinerary in offer.itineraries
+                ]
+            })
+        
+        processed_results = {
+            "count": len(flight_data),
+            "flights": flights
+        }
         
         return processed_results
 
 
 
-client_id = "3k11YFnI3vrwERi7fPXgAvFjQexfY7gg"
-client_secret = "6r9LW52D17vr6UWx"
-
-# Create the toolkit
-flight_toolkit = FlightToolkit(client_id=client_id, client_secret=client_secret, debug=True)
-
 def main():
+    # Reuse the toolkit configured for the travel planner
+    from TourMoreAI import flight_toolkit
+    
     # Create an agent with the flight toolkit
     agent = Agent(
         model=OpenAIChat(id="gpt-4o-mini"),  # or other model of your choice
@@ -249,7 +364,7 @@ def main():
     )
     
     # Example query
-    agent.print_response("Find flights from JFK to LHR on 2025-03-15")
+    asyncio.run(agent.aprint_response("Find flights from JFK to LHR on 2025-03-15"))
 
 
 if __name__ == "__main__":
@@ -1,9 +1,15 @@
 from agno.tools import Toolkit
 from agno.utils.log import logger
 from typing import Dict, Any, Optional, List
+import asyncio
 import os
-import requests
-import json
+import weakref
+import httpx
+from aiolimiter import AsyncLimiter
+import orjson
+
+class PlacesSearchError(Exception):
+    """Raised when Google Maps Places API returns a non-OK status."""
 
 class SimplifiedMapTools(Toolkit):
     """A simplified version of Google Maps tools that avoids complex schema issues."""
@@ -14,10 +20,15 @@ class SimplifiedMapTools(Toolkit):
         if not self.api_key:
             logger.warning("GOOGLE_MAPS_API_KEY not found in environment")
         
+        # The async HTTP client and rate limiters are bound to the event loop they are used on,
+        # so they are created per running loop (see _loop_resources)
+        self._resources_by_loop = weakref.WeakKeyDictionary()
+        
         # Register functions
         self.register(self.search_places)
+        self.register(self.search_places_multi)
     
-    def search_places(self, query: str) -> str:
+    async def search_places(self, query: str) -> str:
         """
         Search for places using Google Maps Places API.
         
@@ -31,32 +42,117 @@ class SimplifiedMapTools(Toolkit):
             return "Error: Google Maps API key is not configured."
         
         try:
-            url = "https://maps.googleapis.com/maps/api/place/textsearch/json"
-            params = {
-                "query": query,
-                "key": self.api_key
-            }
+            places = await self._one_search(query)
+            return orjson.dumps(list(places.values()), option=orjson.OPT_INDENT_2).decode()
             
-            response = requests.get(url, params=params)
-            results = response.json()
+        except PlacesSearchError as e:
+            return str(e)
+        except Exception as e:
+            logger.error(f"Error in search_places: {str(e)}")
+            return f"Error searching places: {str(e)}"
+    
+    async def search_places_multi(self, queries: List[str]) -> str:
+        """
+        Search for several kinds of places at once, e.g. hotels, restaurants, attractions
+        and transport, using Google Maps Places API.
+        
+        Args:
+            queries (List[str]): Search queries for places, one per category
             
-            if results.get("status") != "OK":
-                return f"Error searching Google Maps: {results.get('status')} ({results.get('error_message', 'No error message provided')})"
+        Returns:
+            str: JSON string with place results keyed by query; a place found by an
+                earlier query is not repeated for later ones
+        """
+        if not self.api_key:
+            return "Error: Google Maps API key is not configured."
+        
+        queries = list(dict.fromkeys(queries))
+        results = await asyncio.gather(*[self._one_search(query) for query in queries], return_exceptions=True)
+        
+        seen_place_ids = set()
+        places_by_query = {}
+        for query, result in zip(queries, results):
+            if isinstance(result, PlacesSearchError):
+                places_by_query[query] = str(result)
+                continue
+            if isinstance(result, Exception):
+                logger.error(f"Error in search_places_multi for '{query}': {str(result)}")
+                places_by_query[query] = f"Error searching places: {str(result)}"
+                continue
             
-            # Process and simplify the results
             places = []
-            for place in results.get("results", [])[:10]:  # Limit to 10 results
-                place_details = {
-                    "name": place.get("name", "Unknown"),
-                    "address": place.get("formatted_address", "No address"),
-                    "rating": place.get("rating", 0),
-                    "total_ratings": place.get("user_ratings_total", 0),
-                    "type": ", ".join(place.get("types", ["Unknown"])),
-                }
-                places.append(place_details)
+            for place_id, place_details in result.items():
+                if place_id not in seen_place_ids:
+                    seen_place_ids.add(place_id)
+                    places.append(place_details)
+            places_by_query[query] = places
+        
+        return orjson.dumps(places_by_query, option=orjson.OPT_INDENT_2).decode()
+    
+    def _loop_resources(self):
+        """
+        Get the HTTP client and rate limiters for the running event loop, creating them on first use.
+        
+        Returns:
+            tuple: (httpx.AsyncClient, asyncio.Semaphore, AsyncLimiter)
+        """
+        loop = asyncio.get_running_loop()
+        resources = self._resources_by_loop.get(loop)
+        if resources is None:
+            resources = (
+                # HTTP/2 client so repeated searches reuse pooled keep-alive connections
+                httpx.AsyncClient(http2=True, limits=httpx.Limits(max_keepalive_connections=20)),
+                # Cap in-flight requests and sustained QPS so concurrent searches don't run into 429 retries
+                asyncio.Semaphore(20),
+                AsyncLimiter(10, 1),
+            )
+            self._resources_by_loop[loop] = resources
+        return resources
+    
+    async def aclose(self):
+        """Close the HTTP client used on the running event loop"""
+        resources = self._resources_by_loop.pop(asyncio.get_running_loop(), None)
+        if resources is not None:
+            await resources[0].aclose()
+    
+    async def _one_search(self, query: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Run a single Google Maps Places text search.
+        
+        Args:
+            query (str): Search query for places
             
-            return json.dumps(places, indent=2)
+        Returns:
+            Dict[str, Dict[str, Any]]: Simplified place details keyed by Google place ID
             
-        except Exception as e:
-            logger.error(f"Error in search_places: {str(e)}")
-            return f"Error searching places: {str(e)}"
+        Raises:
+            PlacesSearchError: If Google Maps does not return an OK status
+        """
+        url = "https://maps.googleapis.com/maps/api/place/textsearch/json"
+        params = {
+            "query": query,
+            "key": self.api_key
+        }
+        
+        client, semaphore, limiter = self._loop_resources()
+        async with semaphore, limiter:
+            response = await client.get(url, params=params)
+        results = response.json()
+        
+        if results.get("status") != "OK":
+            raise PlacesSearchError(f"Error searching Google Maps: {results.get('status')} ({results.get('error_message', 'No error message provided')})")
+        
+        # Process and simplify the results
+        places = {}
+        for place in results.get("results", [])[:10]:  # Limit to 10 results
+            place_details = {
+                "name": place.get("name", "Unknown"),
+                "address": place.get("formatted_address", "No address"),
+                "rating": place.get("rating", 0),
+                "total_ratings": place.get("user_ratings_total", 0),
+                "type": ", ".join(place.get("types", ["Unknown"])),
+            }
+            place_id = place.get("place_id") or f"{place_details['name']}|{place_details['address']}"
+            places[place_id] = place_details
+        
+        return places